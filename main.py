@@ -6,11 +6,49 @@ from taskman import TaskManager, ProcessPriority, FIFOProcessStorage, ProcessSor
 
 __version__ = '0.0.1'
 
+
+class CachedFormatter(logging.Formatter):
+    """An implementation of log formatter which formats record time once per second.
+
+    Note:
+        Date format has one second resolution, so all records created within the same second share the same time
+        string and `time.strftime` is called only when second changes. In case no date format is given standard
+        behavior is used as milliseconds are part of the time string.
+    """
+    def __init__(self, fmt: str = None, datefmt: str = None):
+        """A constructor of CachedFormatter class.
+
+        :param fmt: Log record format.
+        :param datefmt: Date format with one second resolution.
+        """
+        super(CachedFormatter, self).__init__(fmt, datefmt)
+        self._last = (None, '')
+
+    def formatTime(self, record: logging.LogRecord, datefmt: str = None) -> str:
+        """Format log record creation time reusing the last formatted value within the same second.
+
+        :param record: Log record.
+        :param datefmt: Date format.
+        :return: Formatted record creation time.
+        """
+        if datefmt is None:
+            return super(CachedFormatter, self).formatTime(record, datefmt)
+
+        sec = int(record.created)
+        last = self._last
+        if last[0] == sec:
+            return last[1]
+
+        result = super(CachedFormatter, self).formatTime(record, datefmt)
+        self._last = (sec, result)
+        return result
+
+
 # # create logger
 log = logging.getLogger('taskman')
 log.setLevel(logging.DEBUG)
 ch = logging.StreamHandler()
-formatter = logging.Formatter('[%(asctime)s][%(name)s][%(levelname)s]%(message)s', '%Y-%m-%d %H:%M:%S')
+formatter = CachedFormatter('[%(asctime)s][%(name)s][%(levelname)s]%(message)s', '%Y-%m-%d %H:%M:%S')
 ch.setFormatter(formatter)
 log.addHandler(ch)
 
@@ -137,6 +175,9 @@ def main():
     # As one process ended by itself, cmd_5 should disappear from the list
     print_process_list(man_prior.list(ProcessSortCriteria.PRIORITY, ProcessSortOrder.ASC))
 
+    # Only two processes with the highest priority (cmd_1 and cmd_4) are needed, so there is no need in full sort
+    print_process_list(man_prior.top(2, ProcessSortCriteria.PRIORITY, ProcessSortOrder.DESC))
+
     num_killed = man_prior.kill_group(ProcessPriority.LOW)
     print(f'Killed {num_killed} processes with LOW priority and {len(man_prior)} left')
 
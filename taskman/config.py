@@ -2,8 +2,9 @@
 config.py: Simulation of build type where task manager capacity defined once.
 """
 import os
+from typing import Final
 
 """Get information about max process storage capacity from the environment. Since python is an interpreter, this will
-simulate build time definition.
+simulate build time definition. Environment variable is always a string, so it is converted to integer once on import.
 """
-PROCESS_STORAGE_CAPACITY = os.getenv('MAX_PROCESSES', 5)
+PROCESS_STORAGE_CAPACITY: Final[int] = int(os.getenv('MAX_PROCESSES', '5'))
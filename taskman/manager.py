@@ -2,10 +2,10 @@
 manager.py: Implementation main interface for process management.
 """
 from logging import Logger
+from typing import List, Optional
 from .process import Process, ProcessPriority
-from .storage import ProcessStorage, ProcessSortCriteria, ProcessSortOrder, StorageOperationResult
+from .storage import ProcessStorage, ProcessSortCriteria, ProcessSortOrder, StorageOperationResult, NULL_LOGGER
 from .pid import PidGenerator
-from .log import Log
 
 
 class TaskManager(object):
@@ -16,14 +16,19 @@ class TaskManager(object):
 
         Behavior of particular instance based on the way object was constructed (which underlying storage is used).
     """
-    def __init__(self, storage: ProcessStorage = ProcessStorage(), logger: Logger = None):
+    def __init__(self, storage: Optional[ProcessStorage] = None, logger: Optional[Logger] = None):
         """A constructor of TaskManager class.
 
-        :param storage: An instance of ProcessStorage class (or any of the child variants).
+        Note:
+            Default storage is created per instance. Default argument value is evaluated only once, so a storage given
+            as default value would be shared by all TaskManager instances created without explicit storage.
+
+        :param storage: An instance of ProcessStorage class (or any of the child variants), ProcessStorage by default.
         :param logger: Instance of standard python logger.
         """
-        self._processes = storage
-        self._log = Log(logger)
+        self._processes = storage if storage is not None else ProcessStorage()
+        self._by_prio = {p: set() for p in ProcessPriority}
+        self._log = logger if logger is not None else NULL_LOGGER
         self._log.debug('TaskManager instance was created')
 
     def add(self, cmd: str, priority: ProcessPriority) -> (None, Process):
@@ -37,17 +42,18 @@ class TaskManager(object):
         :return: Instance of `Process` class on success, None otherwise.
         """
         proc = Process(PidGenerator.generate(), cmd, priority)
-        proc._set_kill_callback(self._process_kill_callback)
+        proc._set_manager(self)
         r = self._processes.add(proc)
-        if r == StorageOperationResult.FAILED:
+        if r is StorageOperationResult.FAILED or r is StorageOperationResult.FULL:
             """In case we were unable to add process into storage we have to kill newly created process in order to
             avoid resource leak.
             """
             proc.kill()
-            self._log.error(f'An error {r} happened when trying to add process to TaskManager')
+            self._log.error('An error %s happened when trying to add process to TaskManager', r)
             return None
 
-        self._log.info(f'Process {proc} was added to TaskManager')
+        self._by_prio[priority].add(proc)
+        self._log.info('Process %s was added to TaskManager', proc)
         return proc
 
     def __len__(self) -> int:
@@ -58,13 +64,40 @@ class TaskManager(object):
         return len(self._processes)
 
     def list(self, criteria: ProcessSortCriteria = ProcessSortCriteria.TIME,
-             order: ProcessSortOrder = ProcessSortOrder.ASC) -> list:
+             order: ProcessSortOrder = ProcessSortOrder.ASC, limit: Optional[int] = None) -> list:
         """List all processes available in the system in order driven by `sort_by` argument.
 
-        :return: Ordered list of Process instances.
+        Note:
+            In case only few processes are needed (for display) `limit` should be given, as it is cheaper than
+            sorting all of them.
+
+        :return: Ordered list of Process instances (at most `limit` of them when given).
+        """
+
+        return self._processes.list(criteria, order, limit)
+
+    def iter_sorted(self, criteria: ProcessSortCriteria = ProcessSortCriteria.TIME,
+                    order: ProcessSortOrder = ProcessSortOrder.ASC):
+        """Iterate over all processes available in the system in order driven by `criteria` and `order` arguments.
+
+        Note:
+            Processes are ordered lazily, so this function is cheaper than `TaskManager.list` when consumer may stop
+            after few processes.
+
+        :return: Iterator over ordered Process instances.
         """
+        return self._processes.iter_sorted(criteria, order)
 
-        return self._processes.list(criteria, order)
+    def top(self, k: int, criteria: ProcessSortCriteria = ProcessSortCriteria.TIME,
+            order: ProcessSortOrder = ProcessSortOrder.ASC) -> List[Process]:
+        """List first `k` processes available in the system in order driven by `criteria` and `order` arguments.
+
+        Note:
+            Shortcut for `TaskManager.list(criteria, order, limit=k)`.
+
+        :return: Ordered list of at most `k` Process instances.
+        """
+        return self._processes.top(k, criteria, order)
 
     def kill(self, process: Process) -> bool:
         """Terminate process based on `Process` instance (descriptor).
@@ -76,41 +109,50 @@ class TaskManager(object):
         :return: True on success, False otherwise.
         """
         r = process.kill()
-        self._log.info(f'{process} was killed with result: {r}')
+        self._log.info('%s was killed with result: %s', process, r)
         return r
 
     def kill_group(self, priority: ProcessPriority) -> int:
         """Terminate all processes with given priority.
 
         Note:
-            This function is not really efficient as we need to repack all `Process` instances from dictionary to a
-            list as we can't remove element from a dictionary while iterating.
+            Processes are grouped by priority when added, so only the processes of given priority are visited. The
+            group is copied into a list as it is modified when killed processes are removed.
 
         :param priority: ProcessPriority value.
         :return: Number of processes terminated successfully.
         """
-        to_kill = list()
-        for k in self._processes:
-            proc = self._processes[k]
-            if proc.priority == priority:
-                to_kill.append(proc)
-
-        return Process.kill_list(to_kill)
+        to_kill = list(self._by_prio[priority])
+        return self._kill_batch(to_kill)
 
     def kill_all(self) -> bool:
         """Terminate all processes known to TaskManager.
 
         Note:
-            This function is not really efficient as we need to repack all `Process` instances from dictionary to a
-            list as we can't remove element from a dictionary while iterating.
+            `Process` instances are copied into a list as we can't remove element from a dictionary while iterating.
+            Copy is done with a single call over dictionary values view.
 
         :return: True if all processes were terminated successfully, False otherwise.
         """
-        to_kill = list()
-        for k in self._processes:
-            to_kill.append(self._processes[k])
+        to_kill = list(self._processes.values())
+        return self._kill_batch(to_kill) == len(to_kill)
 
-        return True if Process.kill_list(to_kill) == len(to_kill) else False
+    def _kill_batch(self, processes: List[Process]) -> int:
+        """Terminate list of processes and remove all of them from TaskManager storage at once.
+
+        Note:
+            Processes are terminated without notifying TaskManager (no `_process_kill_callback` per process), so
+            storage and priority index are updated once for the whole list instead of once per process.
+
+        :param processes: List of processes to be terminated.
+        :return: Number of processes terminated and removed successfully.
+        """
+        killed = [p for p in processes if p._terminate()]
+        for group in self._by_prio.values():
+            group.difference_update(killed)
+        removed = self._processes.remove_many(killed)
+        self._log.debug('%s of %s processes were killed and removed from TaskManager', removed, len(processes))
+        return removed
 
     def _process_kill_callback(self, process: Process) -> bool:
         """Implementation of an internal callback function for removing process from the TaskManager storage.
@@ -124,5 +166,6 @@ class TaskManager(object):
         :param process: Process which successfully processed `Process.kill()` command.
         :return: True if process was removed, False otherwise.
         """
-        self._log.debug(f'Process kill callback for {process} was called')
-        return True if self._processes.remove(process) == StorageOperationResult.OK else False
+        self._log.debug('Process kill callback for %s was called', process)
+        self._by_prio[process.priority].discard(process)
+        return self._processes.remove(process) is StorageOperationResult.OK
@@ -1,43 +1,25 @@
 """
 pid.py: Set of routines and data structure related to Process Identifier management.
 """
-from uuid import uuid1
+from itertools import count
+from typing import ClassVar, NewType
 
 
-class PID(object):
-    """A definition of Process Identifier structure which wraps internal process value into an object instance.
+"""A definition of Process Identifier type.
 
-    Note:
-        At the moment string type is used as process id as it is the most generic type. Usually process IDs are
-        implemented as integers due to performance (also they are compact). But the only requirement of on PID is
-        that it has to be immutable and unique which can be achieved with every data type.
-
-        This implementation doesn't have setter for PID value, so it is read only object.
-
-    See also:
-        Look at PidGenerator class for the information about uniqueness.
-    """
-    def __init__(self, value: str):
-        """A constructor of Process Identifier wrapping class.
+Note:
+    Integer type is used as process id as it is cheap to generate, hash and compare (also it is compact), which is the
+    reason process IDs are usually implemented as integers. The only requirement of on PID is that it has to be
+    immutable and unique which can be achieved with every data type.
 
-        :param value: Underlying value of a Process Identifier.
-        """
-        self._value = value
-
-    def __str__(self) -> str:
-        """Generate string representation of Process Identifier instance.
-
-        :return: String representation of Process Identifier.
-        """
-        return self.value
+    PID is a distinct type only for type checkers (`NewType`), at runtime it is a plain integer. So there is no wrapper
+    object to allocate per process and dictionary lookups by PID use native integer hashing. In case type of PID has to
+    be changed, only this definition and PidGenerator are affected.
 
-    @property
-    def value(self) -> str:
-        """Get Process Identifier value.
-
-        :return: String representation of Process Identifier value.
-        """
-        return self._value
+See also:
+    Look at PidGenerator class for the information about uniqueness.
+"""
+PID = NewType('PID', int)
 
 
 class PidGenerator(object):
@@ -45,31 +27,22 @@ class PidGenerator(object):
     request to generate function.
 
     Note:
-        Uniqueness of PID value achieved by using UUID1 functionality which is eventually MAC address of the host
-        instance and current timestamp using system clock with nanosecond precision. Internally we are using string
-        representation of UUID1 value.
-
-        Using UUID1 can help with debugging of the system as every value can be reversed to a timestamp of creation and
-        exact instance (in case of centralized log collection in distributed system might be useful).
+        Uniqueness of PID value achieved by using monotonically increasing counter shared by all the users of the
+        generator. `itertools.count` is implemented in C and `next` on it can't be interrupted by another thread, so
+        there is no need in additional locking. Generation is O(1) and doesn't need system clock or MAC address
+        lookup (as UUID1 would) which makes it much cheaper on `TaskManager.add` path.
 
-        UUID4 will be generate a random number and in most cases will be unique as well (I would say in all cases as
-        probability of collision is exceptionally low, but still) but UUID1 suits better this purpose.
-
-        UUID1 might be not the best choice in case there is a security concern about instance MAC address, but there is
-        no requirement related to security.
+        Uniqueness is guaranteed only within one python process, which is enough as PID is never shared outside of it.
     """
-    @staticmethod
-    def generate() -> PID:
-        """Generate new Process Identifier value and wrap it into PID object.
+    _counter: ClassVar['count[int]'] = count()
 
-        Note:
-            This method is static, as at the moment there is no need in preserving any state of the object. But in case
-            state of the PID generator has to be stored (for instance in case when integer type needed) it can be
-            moved to class method instead with the same signature.
+    @classmethod
+    def generate(cls) -> PID:
+        """Generate new Process Identifier value.
 
+        Note:
             As this class is not exposed as a public interface changing it's state shouldn't be a big deal.
 
-        :return: PID object.
+        :return: PID value.
         """
-        pid_value = str(uuid1())
-        return PID(str(pid_value))
+        return PID(next(cls._counter))
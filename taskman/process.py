@@ -3,6 +3,9 @@ process.py: Set of data structures to define system process (it is actually stub
 """
 from datetime import datetime as dt
 from enum import IntEnum
+from typing import Any, Optional
+from time import monotonic_ns, time_ns
+from weakref import ref
 from .pid import PID
 
 
@@ -26,31 +29,57 @@ class ProcessPriority(IntEnum):
 
 class Process(object):
     """An implementation of a system process stub.
+
+    Note:
+        Process is created on every `TaskManager.add` and there might be a lot of them, so attributes are declared in
+        `__slots__`. Instance doesn't carry a dictionary which saves memory and makes attribute access faster.
     """
-    def __init__(self, pid: PID, cmd: str, priority: ProcessPriority = ProcessPriority.LOW):
+    __slots__ = ('_pid', '_cmd', '_priority', '_created_ns', '_manager', '_str', '_sort_key_time', '_sort_key_prio')
+    _pid: PID
+    _cmd: str
+    _priority: ProcessPriority
+    _created_ns: int
+    _manager: Optional[ref]
+    _str: Optional[str]
+    _sort_key_time: int
+    _sort_key_prio: int
+
+    def __init__(self, pid: PID, cmd: str, priority: ProcessPriority = ProcessPriority.LOW) -> None:
         """A constructor of Process class.
 
         :param pid: Process Identifier object.
         :param cmd: Process command to execute (kind of execute).
         :param priority: Process execution priority.
-        :param cb: Callback function will be called when process ends (with one or another reason).
         """
         self._pid = pid
         self._cmd = cmd
         self._priority = priority
-        self._created = dt.now()
-        self._cb = None
+        self._created_ns = time_ns()
+        self._manager = None
+        self._str = None
+
+        """Sort keys are computed once as plain integers, so sorting doesn't need to compare `datetime` or enumeration
+        objects. Monotonic clock is used for time ordering as it can't go backwards (unlike system clock).
+        """
+        self._sort_key_time = monotonic_ns()
+        self._sort_key_prio = int(priority)
 
-    def _set_kill_callback(self, cb):
-        """Set callback function for instance of `Process` to call when `Process.kill` method was executed.
+    def _set_manager(self, manager: Any) -> None:
+        """Set owner of `Process` instance which `_process_kill_callback` is called when `Process.kill` method was
+        executed.
 
-        :param cb: Function with single argument of `Process` instance.
+        Note:
+            Only weak reference to the owner is stored. It avoids reference cycle between owner and its processes and
+            weak reference without callback is shared between all processes of the same owner, so there is no
+            per-process allocation (as it would be with bound method).
+
+        :param manager: Object with `_process_kill_callback` method with single argument of `Process` instance.
         :return: None.
         """
-        self._cb = cb
+        self._manager = ref(manager)
 
     @property
-    def cmd(self):
+    def cmd(self) -> str:
         """Get process command (something what is executed, or suppose to be executed).
 
         :return: Process underlying command.
@@ -61,9 +90,15 @@ class Process(object):
     def created(self) -> dt:
         """Get process creation timestamp.
 
+        Note:
+            Creation time is stored as integer number of nanoseconds, as it is much cheaper to get than `datetime`
+            object. Datetime object is built only on request (for presentation). Sub-second part is set separately to
+            avoid floating point rounding.
+
         :return: Instance of datetime object representing process (object) creation time.
         """
-        return self._created
+        seconds, nanoseconds = divmod(self._created_ns, 1000000000)
+        return dt.fromtimestamp(seconds).replace(microsecond=nanoseconds // 1000)
 
     @property
     def pid(self) -> PID:
@@ -84,29 +119,47 @@ class Process(object):
     def __str__(self) -> str:
         """Generate process string representation.
 
+        Note:
+            All the fields are read only, so string is built once (on the first request) and cached.
+
         :return: String representation of a Process class instance.
         """
-        return f'<Process {self.pid} ({self.priority.name}) cmd=({self.cmd}) created={self.created}>'
+        if self._str is None:
+            self._str = f'<Process {self.pid} ({self.priority.name}) cmd=({self.cmd}) created={self.created}>'
+        return self._str
 
     def __repr__(self) -> str:
         """Generate process representation string.
 
         :return: String representation of a Process class instance.
         """
-        return self.__str__()
+        return str(self)
 
     def kill(self) -> bool:
-        """Send signal to the process instance to stop and destroy all resources.
+        """Send signal to the process instance to stop and destroy all resources. Owner of the process (if any) is
+        notified once process is stopped.
+
+        :return: True if process was stopped, False otherwise.
+        """
+        if not self._terminate():
+            return False
+        manager = self._manager() if self._manager is not None else None
+        if manager is not None:
+            return manager._process_kill_callback(self)
+        return True
+
+    def _terminate(self) -> bool:
+        """Send signal to the process instance to stop and destroy all resources without notifying the owner.
 
         Note:
             This function always returns True, as it's just a mock. There is also no signal number, as kill means send
             signal and process will respond accordingly based on signal number. But in this implementation we assume
             that process will be stopped and destroyed.
 
+            It is used directly by the owner when it kills many processes at once and removes them in one batch.
+
         :return: True if process was stopped, False otherwise.
         """
-        if self._cb is not None:
-            return self._cb(self)
         return True
 
     @staticmethod
@@ -116,8 +169,4 @@ class Process(object):
         :param proc_list: Process list.
         :return: Number of processes were killed successfully.
         """
-        result = 0
-        for p in proc_list:
-            if p.kill() is True:
-                result += 1
-        return result
+        return sum(1 for p in proc_list if p.kill())
@@ -2,10 +2,14 @@
 storage.py: Set of data structures and routine for process storage.
 """
 from enum import Enum
+from heapq import heapify, heappop, nlargest, nsmallest
+from itertools import islice
+from logging import Logger, NullHandler, getLogger
+from operator import attrgetter
+from typing import List, Optional
 from .config import PROCESS_STORAGE_CAPACITY
-from .process import Process
+from .process import Process, ProcessPriority
 from .pid import PID
-from .log import Log
 
 
 class StorageOperationResult(Enum):
@@ -49,6 +53,24 @@ class ProcessSortOrder(Enum):
     DESC = 1
 
 
+"""Logger used when no logger was given. This is standard python idiom for a library: logger has only `NullHandler`,
+doesn't propagate records to parent loggers and is disabled, so every log call ends on `isEnabledFor` check.
+"""
+NULL_LOGGER = getLogger('taskman.null')
+NULL_LOGGER.addHandler(NullHandler())
+NULL_LOGGER.propagate = False
+NULL_LOGGER.disabled = True
+
+"""Sort key for every sort criteria. Keys are fetched with `attrgetter` (implemented in C) instead of python lambda.
+Keys read `Process` slots directly rather than properties, as property getter is a python function call.
+"""
+_SORT_KEYS = {
+    ProcessSortCriteria.TIME: attrgetter('_sort_key_time'),
+    ProcessSortCriteria.PRIORITY: attrgetter('_sort_key_prio'),
+    ProcessSortCriteria.PID: attrgetter('_pid'),
+}
+
+
 class ProcessStorage(object):
     """A definition of a process storage class. This interface defines behavior (with some elements of a base class)
     for any process storage implementation which may require along the way.
@@ -69,15 +91,24 @@ class ProcessStorage(object):
         implementation. Even if one use-case (sort by priority) can be satisfied (priority queue for FIFO) still the
         other ones would have something extra to do.
     """
-    def __init__(self, capacity: int = PROCESS_STORAGE_CAPACITY, logger: Log = Log()):
+    def __init__(self, capacity: int = PROCESS_STORAGE_CAPACITY, logger: Optional[Logger] = None):
         """A constructor of default Process Storage class.
 
         :param capacity: Max. number of processes can be stored.
-        :param logger: Instance of package Log class.
+        :param logger: Instance of standard python logger.
         """
         self._capacity = capacity
         self._storage = dict()
-        self._log = logger
+        self._size = 0
+        self._log = logger if logger is not None else NULL_LOGGER
+
+        """Processes are usually added in the order they were created, so storage (dictionary keeps insertion order)
+        is already sorted by creation time and by PID. Flags are cleared once process is added out of order.
+        """
+        self._time_sorted = True
+        self._pid_sorted = True
+        self._last_time = 0
+        self._last_pid = 0
 
     def add(self, process: Process) -> StorageOperationResult:
         """Add Process instance to the storage. In case process storage is full an error will be returned.
@@ -85,80 +116,191 @@ class ProcessStorage(object):
         :param process: Instance of Process to be added to storage.
         :return: One of the StorageOperationResult values.
         """
-        if len(self) >= self._capacity:
-            self._log.warning(f'Process Storage capacity {self._capacity} was reached')
-            return StorageOperationResult.FULL
-
-        pid = process.pid.value
-
-        if pid in self._storage:
+        if process.pid in self._storage:
             """In theory this shouldn't happen, but in case process is submitted multiple times it's better to return
             an error. In case there is no error we will just overwrite the same descriptor without impact on anything,
             but it's still better to report an error, as this is not regular case.
             """
-            self._log.error(f'{process} already exist in the storage')
+            self._log.error('%s already exist in the storage', process)
             return StorageOperationResult.FAILED
 
-        self._storage[pid] = process
-        self._log.debug(f'{process} was added to ProcessStorage')
+        """Duplicate check goes first, so FULL result means process can be inserted once there is a free place.
+        """
+        if self._size >= self._capacity:
+            self._log.warning('Process Storage capacity %s was reached', self._capacity)
+            return StorageOperationResult.FULL
+
+        self._insert(process)
+        if __debug__:
+            """Debug message on the hot path is removed completely when python runs with optimizations (-O).
+            """
+            self._log.debug('%s was added to ProcessStorage', process)
         return StorageOperationResult.OK
 
+    def _insert(self, process: Process):
+        """Insert Process instance into the storage without any checks.
+
+        Note:
+            Caller has to make sure process is not in the storage yet and there is a free place for it.
+
+        :param process: Instance of Process to be inserted into storage.
+        :return: None.
+        """
+        if self._size == 0:
+            self._time_sorted = True
+            self._pid_sorted = True
+        else:
+            if process._sort_key_time < self._last_time:
+                self._time_sorted = False
+            if process.pid < self._last_pid:
+                self._pid_sorted = False
+        self._last_time = process._sort_key_time
+        self._last_pid = process.pid
+
+        self._storage[process.pid] = process
+        self._size += 1
+
     def remove(self, process: Process) -> StorageOperationResult:
         """Remove Process instance from the storage.
 
+        Note:
+            Process is looked up and deleted with a single `pop`, storage never keeps None values.
+
         :param process: Process instance to be removed.
-        :return:
+        :return: One of the StorageOperationResult values.
         """
-        pid = process.pid.value
-        if pid not in self._storage:
-            self._log.warning(f'{process} does not exist in ProcessStorage')
+        if self._storage.pop(process.pid, None) is None:
+            self._log.warning('%s does not exist in ProcessStorage', process)
             return StorageOperationResult.FAILED
 
-        del self._storage[pid]
+        self._size -= 1
         return StorageOperationResult.OK
 
+    def remove_many(self, processes: List[Process]) -> int:
+        """Remove multiple Process instances from the storage at once.
+
+        :param processes: List of processes to be removed.
+        :return: Number of processes removed from the storage.
+        """
+        storage = self._storage
+        removed = 0
+        for p in processes:
+            if storage.pop(p.pid, None) is not None:
+                removed += 1
+        self._size -= removed
+        return removed
+
     def list(self, criteria: ProcessSortCriteria = ProcessSortCriteria.TIME,
-             order: ProcessSortOrder = ProcessSortOrder.ASC) -> list:
+             order: ProcessSortOrder = ProcessSortOrder.ASC, limit: Optional[int] = None) -> list:
         """Provide list of all processes available in the storage sorted by `criteria` in `order`.
 
+        Note:
+            Sort criteria is mapped to pre-computed sort key, so there is no need to decide which one to use. List is
+            built from dictionary values view in a single call.
+
+            In case `limit` is given only first `limit` processes are provided. Only `limit` processes are kept
+            ordered (with a heap) while walking over the storage, so complexity is O(n log k) instead of O(n log n)
+            of the full sort. Result is the same as the full list cut to `limit` processes.
+
+            Ascending order by creation time or by PID is usually the order of the storage itself, in this case
+            processes are provided without sorting at all (O(n)).
+
         :param criteria: One of the `ProcessSortCriteria` values.
         :param order: On of the `ProcessSortOrder` values.
+        :param limit: Max. number of processes to provide, None to provide all of them. Negative value is the same
+                      as zero (empty list).
         :return: Sorted list of processes.
         """
-        result = list()
-        for k in self._storage:
-            """We are going to iterate over dictionary (hashmap) with processes and create a list.
+        if limit is not None and limit < 0:
+            """Negative limit is clamped once, so every path below provides the same (empty) result.
+            """
+            limit = 0
+
+        is_desc_order = order is ProcessSortOrder.DESC
+        if not is_desc_order and (criteria is ProcessSortCriteria.TIME and self._time_sorted or
+                                  criteria is ProcessSortCriteria.PID and self._pid_sorted):
+            """Storage is already in requested order, so there is nothing to sort. Equal creation times are kept in
+            insertion order, exactly as stable sort would do.
             """
-            result.append(self._storage[k])
+            values = self._storage.values()
+            return list(values) if limit is None else list(islice(values, limit))
+
+        if limit is not None:
+            select = nlargest if is_desc_order else nsmallest
+            return select(limit, self._storage.values(), key=_SORT_KEYS[criteria])
+
+        return sorted(self._storage.values(), key=_SORT_KEYS[criteria], reverse=is_desc_order)
+
+    def iter_sorted(self, criteria: ProcessSortCriteria = ProcessSortCriteria.TIME,
+                    order: ProcessSortOrder = ProcessSortOrder.ASC):
+        """Iterate over all processes available in the storage sorted by `criteria` in `order`.
+
+        Note:
+            Processes are ordered lazily: storage is copied into a heap (O(n)) when iteration starts and every next
+            process costs O(log n). Consumer which stops after few processes doesn't pay for the full sort. Order is
+            the same as `list(criteria, order)`, equal keys are kept in insertion order.
+
+            Iteration goes over the copy, so processes can be killed while iterating.
+
+        :param criteria: One of the `ProcessSortCriteria` values.
+        :param order: On of the `ProcessSortOrder` values.
+        :return: Iterator over sorted processes.
+        """
+        if order is ProcessSortOrder.ASC and (criteria is ProcessSortCriteria.TIME and self._time_sorted or
+                                              criteria is ProcessSortCriteria.PID and self._pid_sorted):
+            yield from list(self._storage.values())
+            return
 
-        """Decide which sorting criteria to use and perform inplace sorting.
+        """All sort keys are integers, so descending order is ascending order of negated keys. Insertion index makes
+        entries unique, so `Process` objects are never compared.
         """
-        is_desc_order = True if order == ProcessSortOrder.DESC else False
-        if criteria == ProcessSortCriteria.TIME:
-            result.sort(key=lambda item: item.created, reverse=is_desc_order)
-        elif criteria == ProcessSortCriteria.PRIORITY:
-            result.sort(key=lambda item: item.priority, reverse=is_desc_order)
-        elif criteria == ProcessSortCriteria.PID:
-            result.sort(key=lambda item: item.pid.value, reverse=is_desc_order)
+        key = _SORT_KEYS[criteria]
+        sign = -1 if order is ProcessSortOrder.DESC else 1
+        heap = [(sign * key(p), i, p) for i, p in enumerate(self._storage.values())]
+        heapify(heap)
+        while heap:
+            yield heappop(heap)[-1]
 
-        return result
+    def top(self, k: int, criteria: ProcessSortCriteria = ProcessSortCriteria.TIME,
+            order: ProcessSortOrder = ProcessSortOrder.ASC) -> List[Process]:
+        """Provide first `k` processes available in the storage sorted by `criteria` in `order`.
+
+        Note:
+            Shortcut for `list(criteria, order, limit=k)`.
+
+        :param k: Max. number of processes to provide.
+        :param criteria: One of the `ProcessSortCriteria` values.
+        :param order: On of the `ProcessSortOrder` values.
+        :return: Sorted list of at most `k` processes.
+        """
+        return self.list(criteria, order, k)
 
     def __len__(self) -> int:
         """Get number of processes stored in the storage.
 
+        Note:
+            Number of processes is tracked by add/remove operations, so it is available without a call.
+
         :return: Number of processes stored in the storage.
         """
-        return len(self._storage)
+        return self._size
 
     def __getitem__(self, item: PID) -> Process:
         """Get instance of `Process` by PID.
 
         :raises KeyError in case process was not found.
-        :param item: Instance of PID class.
+        :param item: PID value.
         :return: `Process` instance.
         """
         return self._storage.__getitem__(item)
 
+    def values(self):
+        """Get view of all `Process` instances stored in the storage.
+
+        :return: Dictionary view of `Process` instances.
+        """
+        return self._storage.values()
+
     def __iter__(self):
         """Get ProcessStorage iterator.
 
@@ -172,40 +314,53 @@ class FIFOProcessStorage(ProcessStorage):
 
     Note:
         This class should be able to always add new process as it will just remove the oldest one.
+
+        The oldest process is the one which was added first (insertion order), not the one with the smallest creation
+        timestamp. So eviction order doesn't depend on system clock (which may be adjusted backwards) and processes
+        created at the same time are still evicted in the order they were added.
     """
     def add(self, process: Process) -> StorageOperationResult:
         """Add new process to the process storage. In case process storage is full the oldest process will be removed
         from the storage and new one will take its place.
 
         Note:
-            This implementation worst case complexity is O(n) as we need to find min value among all the processes.
+            Dictionary preserves insertion order, so the first key of the storage is always the oldest process (the
+            one which was added first). Finding it is O(1) and doesn't need to compare creation time of all processes.
 
         :param process: Process instance to be added.
         :return: StorageOperationResult.OK when process was added.
         """
         r = super(FIFOProcessStorage, self).add(process)
 
-        if r != StorageOperationResult.FULL:
+        if r is not StorageOperationResult.FULL:
             """In this implementation we follow logic of default implementation unless storage is full.
             """
             return r
 
-        """Find the oldest process by checking min (process creation time) value among all the processes.
+        if not self._storage:
+            """Storage is full while empty only when its capacity is zero, so there is nothing to evict.
+            """
+            self._log.warning('%s can not be added as there is no process to remove in the storage', process)
+            return StorageOperationResult.FAILED
+
+        """Oldest process is the first one in the storage (in insertion order).
         """
-        oldest = min(self._storage.keys(), key=(lambda key: self._storage[key].created))
-        self._log.debug(f'Found oldest process {self._storage[oldest]} in the FIFOProcessStorage')
+        oldest = next(iter(self._storage.values()))
+        self._log.debug('Found oldest process %s in the FIFOProcessStorage', oldest)
 
-        """Once oldest process identified remove it from the dictionary and call standard method again. As it would be
+        """Once oldest process identified kill it and insert new process into its place. Standard method is not called
+        again as it has been already checked that new process can be inserted once there is a free place. It would be
         good to provide error code for the calling function with a feedback that we killed one of the processes.
-        """
-        self._storage[oldest].kill()
-        r = super(FIFOProcessStorage, self).add(process)
-        if r == StorageOperationResult.OK:
-            self._log.debug(f'New {process} was added while oldest was removed')
-            return StorageOperationResult.REMOVED_OLDEST
 
-        self._log.error(f'Something unexpected happened when adding new {process} into FIFOProcessStorage')
-        return StorageOperationResult.FAILED
+        Killed process is removed from the storage through the kill callback of its owner. In case there is no owner
+        process is still in the storage and has to be removed here.
+        """
+        oldest.kill()
+        if oldest.pid in self._storage:
+            self.remove(oldest)
+        self._insert(process)
+        self._log.debug('New %s was added while oldest was removed', process)
+        return StorageOperationResult.REMOVED_OLDEST
 
 
 class PriorityProcessStorage(ProcessStorage):
@@ -214,8 +369,26 @@ class PriorityProcessStorage(ProcessStorage):
     Note:
         This implementation suppose to insert new process (in case of full storage) only if new process priority is
         bigger than lowest one. In case there are multiple processes with lower priority (comparing to the new one)
-        the oldest (based on creation time) will be removed and killed.
+        the oldest one will be removed and killed.
+
+        The oldest process is the one which was added first (insertion order), not the one with the smallest creation
+        timestamp. So eviction order doesn't depend on system clock (which may be adjusted backwards) and processes
+        created at the same time are still evicted in the order they were added.
+
+        Besides the dictionary, processes are grouped into buckets (dictionaries as well) by priority. Buckets are kept
+        in ascending priority order and every bucket keeps its processes in insertion order. So the process to be
+        evicted is the first process of the first non-empty bucket. Eviction costs O(P), where P is a number of
+        priority levels (small and fixed), instead of scanning the whole storage. Add and remove stay O(1).
     """
+    def __init__(self, capacity: int = PROCESS_STORAGE_CAPACITY, logger: Optional[Logger] = None):
+        """A constructor of Priority Process Storage class.
+
+        :param capacity: Max. number of processes can be stored.
+        :param logger: Instance of standard python logger.
+        """
+        super(PriorityProcessStorage, self).__init__(capacity, logger)
+        self._by_priority = {p: dict() for p in sorted(ProcessPriority)}
+
     def add(self, process: Process) -> StorageOperationResult:
         """Add new process to the process storage. In case storage is full process with lower priority will be deleted.
 
@@ -224,29 +397,70 @@ class PriorityProcessStorage(ProcessStorage):
         """
         r = super(PriorityProcessStorage, self).add(process)
 
-        if r != StorageOperationResult.FULL:
+        if r is not StorageOperationResult.FULL:
             """In this implementation we follow logic of default implementation unless storage is full.
             """
             return r
 
-        key_lowest_priority = min(self._storage.keys(), key=(lambda key: self._storage[key].priority))
-        lowest_priority = self._storage[key_lowest_priority].priority
+        lowest_priority, lowest_bucket = self._lowest()
 
-        if process.priority <= lowest_priority:
-            self._log.warning(f'{process} can not be added as lowest priority in the storage {lowest_priority}')
+        if lowest_bucket is None or process.priority <= lowest_priority:
+            self._log.warning('%s can not be added as lowest priority in the storage %s', process, lowest_priority)
             return StorageOperationResult.FAILED
 
-        lowest_priority_processes = list()
-        for k in self._storage:
-            if self._storage[k].priority == lowest_priority:
-                lowest_priority_processes.append(self._storage[k])
+        """First process of the bucket is the oldest process among the processes with the lowest priority.
+        """
+        oldest_among_lowest = next(iter(lowest_bucket.values()))
 
-        oldest_among_lowest = min(lowest_priority_processes, key=lambda item: item.created)
-        pid = oldest_among_lowest.pid.value
-        del self._storage[pid]
-        r = super(PriorityProcessStorage, self).add(process)
-        if r == StorageOperationResult.OK:
-            self._log.debug(f'New {process} was added while oldest was removed')
-            return StorageOperationResult.REMOVED_LOWEST
+        """Victim has to be killed (not only forgotten) so the owner of the process is notified through the kill
+        callback. In case there is no owner process is still in the storage and has to be removed here. New process is
+        inserted directly, as standard method has already checked that it can be inserted once there is a free place.
+        """
+        oldest_among_lowest.kill()
+        if oldest_among_lowest.pid in self._storage:
+            self.remove(oldest_among_lowest)
+        self._insert(process)
+        self._log.debug('New %s was added while oldest was removed', process)
+        return StorageOperationResult.REMOVED_LOWEST
+
+    def _insert(self, process: Process):
+        """Insert Process instance into the storage and into its priority bucket without any checks.
+
+        :param process: Instance of Process to be inserted into storage.
+        :return: None.
+        """
+        super(PriorityProcessStorage, self)._insert(process)
+        self._by_priority[process.priority][process.pid] = process
 
-        return StorageOperationResult.OK
+    def remove(self, process: Process) -> StorageOperationResult:
+        """Remove Process instance from the storage and from its priority bucket.
+
+        :param process: Process instance to be removed.
+        :return: One of the StorageOperationResult values.
+        """
+        r = super(PriorityProcessStorage, self).remove(process)
+        if r is StorageOperationResult.OK:
+            del self._by_priority[process.priority][process.pid]
+        return r
+
+    def remove_many(self, processes: List[Process]) -> int:
+        """Remove multiple Process instances from the storage and from their priority buckets at once.
+
+        :param processes: List of processes to be removed.
+        :return: Number of processes removed from the storage.
+        """
+        removed = super(PriorityProcessStorage, self).remove_many(processes)
+        by_priority = self._by_priority
+        for p in processes:
+            by_priority[p.priority].pop(p.pid, None)
+        return removed
+
+    def _lowest(self) -> tuple:
+        """Get the lowest priority among the stored processes and bucket of processes with this priority.
+
+        :return: Tuple of priority and its bucket, (None, None) in case storage is empty.
+        """
+        for priority, bucket in self._by_priority.items():
+            if bucket:
+                return priority, bucket
+        return None, None